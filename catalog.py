@@ -0,0 +1,138 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from os import PathLike
+from pathlib import Path
+from typing import Union
+
+import pandas as pd
+
+__all__ = [
+    "connect",
+    "get_run",
+    "hash_series",
+    "hash_spec",
+    "record_run",
+    "select_runs",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    series_key TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    spec_hash TEXT NOT NULL,
+    arima_order TEXT,
+    arima_sorder TEXT,
+    status TEXT NOT NULL,
+    message TEXT,
+    duration REAL,
+    output_csv TEXT,
+    output_png TEXT,
+    output_svg TEXT,
+    error_path TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status);
+"""
+
+# applied in order to an older catalog, tracked with PRAGMA user_version
+MIGRATIONS = [
+    "ALTER TABLE runs ADD COLUMN error_path TEXT",
+    "DROP INDEX IF EXISTS runs_hashes",
+]
+
+# hash of a series whose input is not known, never matches hash_series
+UNKNOWN_HASH = ""
+
+
+def connect(path: Union[str, PathLike] = "output/catalog.sqlite"):
+    """Open the run catalog, creating or migrating the table as needed."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(str(path))
+    con.row_factory = sqlite3.Row
+
+    exists = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'runs'"
+    ).fetchone()
+    if exists is None:
+        con.executescript(SCHEMA)
+    else:
+        version = con.execute("PRAGMA user_version").fetchone()[0]
+        with con:
+            for migration in MIGRATIONS[version:]:
+                con.execute(migration)
+    con.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+    return con
+
+
+def hash_series(s: pd.Series) -> str:
+    """Hash the values and dates of an input series."""
+    hashes = pd.util.hash_pandas_object(s, index=True).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+
+def hash_spec(options: dict) -> str:
+    """Hash the x13 options, so a change in the spec reruns the series."""
+    return hashlib.sha256(
+        json.dumps(options, sort_keys=True, default=str).encode("utf8")
+    ).hexdigest()
+
+
+def get_run(con: sqlite3.Connection, series_key: str):
+    """Latest run of a series, or None if it was never run."""
+    return con.execute(
+        "SELECT * FROM runs WHERE series_key = ?", (series_key,)
+    ).fetchone()
+
+
+def select_runs(con: sqlite3.Connection, status=None):
+    """All runs, or only the runs with the given status, e.g. "error"."""
+    if status is None:
+        return con.execute("SELECT * FROM runs ORDER BY series_key").fetchall()
+    return con.execute(
+        "SELECT * FROM runs WHERE status = ? ORDER BY series_key", (status,)
+    ).fetchall()
+
+
+def record_run(
+    con: sqlite3.Connection,
+    series_key: str,
+    input_hash: str,
+    spec_hash: str,
+    status: str,
+    message=None,
+    duration=None,
+    order=None,
+    sorder=None,
+    output_csv=None,
+    output_png=None,
+    output_svg=None,
+    error_path=None,
+):
+    """Insert or replace the run of a series and commit right away."""
+    with con:
+        con.execute(
+            """
+            INSERT OR REPLACE INTO runs (
+                series_key, input_hash, spec_hash, arima_order, arima_sorder,
+                status, message, duration, output_csv, output_png, output_svg,
+                error_path, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                series_key,
+                input_hash,
+                spec_hash,
+                None if order is None else str(tuple(order)),
+                None if sorder is None else str(tuple(sorder)),
+                status,
+                message,
+                duration,
+                output_csv,
+                output_png,
+                output_svg,
+                error_path,
+                datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
@@ -1,5 +1,7 @@
+import argparse
 from pathlib import Path
 import re
+import time
 import traceback
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -7,7 +9,9 @@ import statsmodels.api as sm
 from korean_romanizer.romanizer import Romanizer
 from statsmodels.tsa.x13 import X13Error
 
+import catalog
 import data
+import prescreen
 import x13
 
 
@@ -16,7 +20,7 @@ plt.style.use("./auri.mplstyle")
 pd.options.display.unicode.east_asian_width = True
 
 
-def run_x13(s: pd.Series, name=None, x12path="./x13as/x13as.exe"):
+def run_x13(s: pd.Series, name=None, x12path="./x13as/x13as.exe", **kwargs):
     if name is None:
         name = s.name
 
@@ -34,7 +38,7 @@ def run_x13(s: pd.Series, name=None, x12path="./x13as/x13as.exe"):
     s_new = s_new.fillna(0)
 
     try:
-        results = x13.x13_arima_analysis(s_new, x12path=x12path)
+        results = x13.x13_arima_analysis(s_new, x12path=x12path, **kwargs)
     except X13Error as e:
         raise e
 
@@ -56,27 +60,91 @@ def run_x13(s: pd.Series, name=None, x12path="./x13as/x13as.exe"):
     return df_result, fig, order, sorder
 
 
+parser = argparse.ArgumentParser(description="seasonal adjustment with x13as")
+group = parser.add_mutually_exclusive_group()
+group.add_argument(
+    "--only-failed", action="store_true", help="rerun only series that failed"
+)
+group.add_argument(
+    "--only-changed",
+    action="store_true",
+    help="rerun only series whose input or x13 options changed",
+)
+parser.add_argument("--catalog", default="output/catalog.sqlite")
+args = parser.parse_args()
+
+# options passed to the pre-screen and x13, hashed to find series run with
+# a different spec
+screen_options = dict(min_length=36, max_zero_share=0.5, alpha=0.05)
+x13_options = dict(maxorder=(2, 1), maxdiff=(2, 1), log=None, outlier=True)
+spec_hash = catalog.hash_spec({"prescreen": screen_options, "x13": x13_options})
+
 Path("output").mkdir(exist_ok=True)
+con = catalog.connect(args.catalog)
 
 dfs_approval = data.process_data()
 
 for key, df in dfs_approval.items():
+    # skip series without identifiable seasonality before running x13
+    df_screen = prescreen.screen_seasonality(df, **screen_options)
+    df_screen.to_csv(f"output/prescreen_{key}.csv", encoding="utf-8-sig")
+
     for label, s in df.items():
         name = "_".join([key, *s.name])
         # sanitize name
         name = re.sub("\\W", "_", name)
 
-        if Path(f"output/{name}.csv").exists():
+        if "_동수_" in name:  # skip building count
+            continue
+
+        input_hash = catalog.hash_series(s)
+        run = catalog.get_run(con, name)
+
+        if args.only_failed:
+            if run is None or run["status"] != "error":
+                continue
+        elif args.only_changed:
+            if (
+                run is not None
+                and run["input_hash"] == input_hash
+                and run["spec_hash"] == spec_hash
+            ):
+                continue
+        elif run is not None:  # resume
+            print(f"already in catalog: {name} ({run['status']})")
+            continue
+        elif Path(f"output/{name}.csv").exists():
+            # finished before the catalog existed, backfill it with an unknown
+            # input so --only-changed reruns it once
             print(f"csv already exists: {name}")
+            catalog.record_run(
+                con,
+                name,
+                catalog.UNKNOWN_HASH,
+                spec_hash,
+                "done",
+                output_csv=f"output/{name}.csv",
+                output_png=f"output/{name}.png",
+                output_svg=f"output/{name}.svg",
+            )
             continue
 
-        if "_동수_" in name:  # skip building count
+        reason = df_screen.loc[label, "reason"]
+        if reason:
+            print(f"skipped: {name} ({reason})")
+            Path("skipped").mkdir(exist_ok=True)
+            with open(f"skipped/{name}.txt", "w") as f:
+                print(df_screen.loc[label].to_string(), file=f)
+            catalog.record_run(
+                con, name, input_hash, spec_hash, "skipped", message=reason
+            )
             continue
 
         print(f"{name}...")
 
+        start = time.perf_counter()
         try:
-            df_result, fig, order, sorder = run_x13(s, name)
+            df_result, fig, order, sorder = run_x13(s, name, **x13_options)
             print(order, sorder, end=" ")
             df_result.to_csv(f"output/{name}.csv", encoding="utf-8-sig")
             fig.savefig(f"output/{name}.png")
@@ -86,5 +154,30 @@ for key, df in dfs_approval.items():
             Path("error").mkdir(exist_ok=True)
             with open(f"error/{name}.txt", "w") as f:
                 traceback.print_exc(file=f)
+            catalog.record_run(
+                con,
+                name,
+                input_hash,
+                spec_hash,
+                "error",
+                message=str(e),
+                duration=time.perf_counter() - start,
+                error_path=f"error/{name}.txt",
+            )
         else:
             print("done")
+            catalog.record_run(
+                con,
+                name,
+                input_hash,
+                spec_hash,
+                "done",
+                duration=time.perf_counter() - start,
+                order=order,
+                sorder=sorder,
+                output_csv=f"output/{name}.csv",
+                output_png=f"output/{name}.png",
+                output_svg=f"output/{name}.svg",
+            )
+
+con.close()
@@ -0,0 +1,197 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+__all__ = ["screen_seasonality"]
+
+
+def screen_seasonality(
+    df: pd.DataFrame,
+    min_length=36,
+    max_zero_share=0.5,
+    alpha=0.05,
+) -> pd.DataFrame:
+    """
+    Screen every column of a monthly frame for identifiable seasonality.
+
+    Each column is trimmed to its first and last valid values and missing
+    values in the middle are filled with 0, as done before running x13. The
+    seasonality tests are computed on the first differences, for all columns
+    at once.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Monthly series in columns with a DatetimeIndex, as returned by
+        ``data.process_data()``.
+    min_length : int
+        Minimum number of observations. X-13 needs at least three years.
+    max_zero_share : float
+        Maximum share of zero values in the trimmed series.
+    alpha : float
+        Family-wise significance level. A series qualifies if any of the QS,
+        Friedman or Kruskal-Wallis tests rejects the null of no seasonality
+        at the Bonferroni level ``alpha / 3``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per column of ``df`` with the test statistics, p-values,
+        ``qualified`` flag and the ``reason`` a series was skipped.
+    """
+    values, inside = _trim_and_fill(df)
+    n_obs = inside.sum(axis=0)
+    zero_share = np.divide(
+        ((values == 0) & inside).sum(axis=0),
+        n_obs,
+        out=np.full(n_obs.shape, np.nan),
+        where=n_obs > 0,
+    )
+
+    diff = values[1:] - values[:-1]
+    diff_index = df.index[1:]
+
+    qs, qs_pvalue = _qs_test(diff)
+    friedman, friedman_pvalue = _friedman_test(diff, diff_index)
+    kruskal, kruskal_pvalue = _kruskal_test(diff, diff_index)
+
+    constant = ~(np.nan_to_num(diff) != 0).any(axis=0)
+    pvalues = [qs_pvalue, friedman_pvalue, kruskal_pvalue]
+    seasonal = np.fmin.reduce(pvalues) < alpha / len(pvalues)
+
+    # the first matching reason wins
+    reason = np.select(
+        [
+            n_obs == 0,
+            n_obs < min_length,
+            zero_share > max_zero_share,
+            constant,
+            ~seasonal,
+        ],
+        [
+            "empty",
+            "too short",
+            "mostly zeros",
+            "constant",
+            "no identifiable seasonality",
+        ],
+        default="",
+    )
+
+    return pd.DataFrame(
+        {
+            "n_obs": n_obs,
+            "zero_share": zero_share,
+            "qs": qs,
+            "qs_pvalue": qs_pvalue,
+            "friedman": friedman,
+            "friedman_pvalue": friedman_pvalue,
+            "kruskal": kruskal,
+            "kruskal_pvalue": kruskal_pvalue,
+            "qualified": reason == "",
+            "reason": reason,
+        },
+        index=df.columns,
+    )
+
+
+def _trim_and_fill(df: pd.DataFrame):
+    values = df.to_numpy(dtype="float64")
+    valid = ~np.isnan(values)
+
+    # inside the span between the first and last valid values
+    inside = (
+        np.logical_or.accumulate(valid, axis=0)
+        & np.logical_or.accumulate(valid[::-1], axis=0)[::-1]
+    )
+
+    # fill missing values in the middle, leave NaN at each ends
+    values = np.where(inside, np.nan_to_num(values, nan=0.0), np.nan)
+    return values, inside
+
+
+def _qs_test(diff: np.ndarray):
+    """QS statistic on the autocorrelations at lags 12 and 24."""
+    m = (~np.isnan(diff)).sum(axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        mean = np.nanmean(diff, axis=0, keepdims=True)
+    centered = np.nan_to_num(diff - mean)
+    denom = (centered**2).sum(axis=0)
+
+    def acf(lag):
+        num = (centered[lag:] * centered[:-lag]).sum(axis=0)
+        return np.divide(num, denom, out=np.zeros(denom.shape), where=denom > 0)
+
+    rho12 = np.maximum(acf(12), 0)
+    # the lag 24 term only counts when the lag 12 autocorrelation is positive
+    rho24 = np.where(rho12 > 0, np.maximum(acf(24), 0), 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        qs = m * (m + 2) * (rho12**2 / (m - 12) + rho24**2 / (m - 24))
+    qs = np.where(m > 24, qs, np.nan)
+    return qs, stats.chi2.sf(qs, 2)
+
+
+def _friedman_test(diff: np.ndarray, index: pd.DatetimeIndex):
+    """Friedman test with years as blocks and months as treatments."""
+    years = (index.year - index.year.min()).to_numpy()
+    months = (index.month - 1).to_numpy()
+
+    # (year, month, column) layout, NaN where a month is missing
+    grid = np.full((years.max() + 1, 12, diff.shape[1]), np.nan)
+    grid[years, months] = diff
+
+    complete = ~np.isnan(grid).any(axis=1)
+    b = complete.sum(axis=0)
+    k = 12
+
+    filled = np.nan_to_num(grid)
+    ranks = stats.rankdata(filled, method="average", axis=1)
+    ties = (
+        stats.rankdata(filled, method="max", axis=1)
+        - stats.rankdata(filled, method="min", axis=1)
+        + 1
+    )
+
+    block = complete[:, np.newaxis, :]
+    rank_sums = np.where(block, ranks, 0).sum(axis=0)
+    tie_sum = np.where(block, ties**2 - 1, 0).sum(axis=(0, 1))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = 12 / (b * k * (k + 1)) * (rank_sums**2).sum(axis=0) - 3 * b * (k + 1)
+        q = q / (1 - tie_sum / (b * (k**3 - k)))
+    q = np.where((b >= 2) & np.isfinite(q), q, np.nan)
+    return q, stats.chi2.sf(q, k - 1)
+
+
+def _kruskal_test(diff: np.ndarray, index: pd.DatetimeIndex):
+    """Kruskal-Wallis test with months as groups."""
+    months = (index.month - 1).to_numpy()
+    frame = pd.DataFrame(diff)
+    ranks = frame.rank(axis=0, method="average").to_numpy()
+    ties = (
+        frame.rank(axis=0, method="max").to_numpy()
+        - frame.rank(axis=0, method="min").to_numpy()
+        + 1
+    )
+
+    valid = ~np.isnan(diff)
+    n = valid.sum(axis=0)
+
+    # (month, column) rank sums and group sizes
+    onehot = months[np.newaxis, :] == np.arange(12)[:, np.newaxis]
+    n_group = onehot.astype("float64") @ valid
+    rank_sums = onehot.astype("float64") @ np.nan_to_num(ranks)
+    groups = (n_group > 0).sum(axis=0)
+
+    tie_sum = np.nansum(ties**2 - 1, axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = np.where(n_group > 0, rank_sums**2 / n_group, 0).sum(axis=0)
+        h = 12 / (n * (n + 1)) * between - 3 * (n + 1)
+        h = h / (1 - tie_sum / (n**3 - n))
+    h = np.where((groups >= 2) & np.isfinite(h), h, np.nan)
+    return h, stats.chi2.sf(h, np.maximum(groups - 1, 1))
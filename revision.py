@@ -0,0 +1,303 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from warnings import warn
+
+import numpy as np
+import pandas as pd
+from statsmodels.tools.sm_exceptions import X13Error, X13Warning
+from statsmodels.tools.tools import Bunch
+
+import x13
+
+__all__ = ["revision_history", "sliding_spans"]
+
+# X-13 needs at least three years of monthly data
+MIN_LENGTH = 36
+
+
+def revision_history(
+    endog,
+    n_vintages=24,
+    max_workers=None,
+    x12path="./x13as/x13as.exe",
+    **kwargs,
+):
+    """
+    Revision history of the seasonally adjusted series over expanding vintages.
+
+    The full span is run once with automatic model identification. Each
+    vintage ends one month earlier than the next and reuses the full-span
+    ARIMA model and transformation, and all vintages run concurrently.
+
+    Parameters
+    ----------
+    endog : pandas.Series or pandas.DataFrame
+        Monthly series, or a frame with one series per column as returned by
+        ``data.process_data()``.
+    n_vintages : int
+        Number of truncated vintages, ending at the last ``n_vintages``
+        months before the full span. Vintages shorter than ``MIN_LENGTH``
+        are left out.
+    max_workers : int or None
+        Maximum number of x13 runs at once. Passed to ThreadPoolExecutor.
+    x12path : str or None
+        The path to the x13 binary.
+    **kwargs
+        Passed to ``x13.x13_arima_analysis``.
+
+    Returns
+    -------
+    Bunch or dict of Bunch
+        For a frame, a dict keyed by column with one Bunch per series.
+
+        Failed vintages are left out of ``seasadj`` with an X13Warning. For a
+        Series, a failed full span raises X13Error and a series too short
+        for any vintage raises ValueError. For a frame, such columns are left
+        out with a warning.
+
+        - seasadj : pandas.DataFrame
+          Seasonally adjusted series by vintage end date (rows) and date
+          (columns). The last row is the full span.
+        - revisions : pandas.DataFrame
+          Concurrent and final estimates and the percent revision by date.
+        - stats : pandas.Series
+          Mean, mean absolute and maximum absolute percent revisions.
+        - order, sorder : tuple
+          The full-span ARIMA model reused for the vintages.
+    """
+
+    def make_spans(s):
+        return [s.index[: len(s) - i] for i in range(n_vintages, 0, -1)]
+
+    res = _run_spans(endog, make_spans, max_workers, x12path, kwargs)
+    if isinstance(endog, pd.DataFrame):
+        return {label: _revision_stats(r) for label, r in res.items()}
+    return _revision_stats(res)
+
+
+def sliding_spans(
+    endog,
+    span_length=96,
+    n_spans=4,
+    threshold=3.0,
+    max_workers=None,
+    x12path="./x13as/x13as.exe",
+    **kwargs,
+):
+    """
+    Sliding spans diagnostic of the seasonally adjusted series.
+
+    Spans of ``span_length`` months end at the last observation and at each
+    of the previous years. Each span reuses the full-span ARIMA model and
+    transformation, and all spans run concurrently.
+
+    Parameters
+    ----------
+    endog : pandas.Series or pandas.DataFrame
+        Monthly series, or a frame with one series per column as returned by
+        ``data.process_data()``.
+    span_length : int
+        Length of each span in months. X-13 uses up to eight years. It is
+        shortened to fit ``n_spans`` spans into a short series, and a series
+        is skipped if the spans would be shorter than ``MIN_LENGTH``.
+    n_spans : int
+        Number of spans, each starting a year after the previous one.
+    threshold : float
+        Maximum percent difference between spans for a date to be stable.
+    max_workers : int or None
+        Maximum number of x13 runs at once. Passed to ThreadPoolExecutor.
+    x12path : str or None
+        The path to the x13 binary.
+    **kwargs
+        Passed to ``x13.x13_arima_analysis``.
+
+    Returns
+    -------
+    Bunch or dict of Bunch
+        For a frame, a dict keyed by column with one Bunch per series.
+
+        Failed spans are left out of ``seasadj`` with an X13Warning. For a
+        Series, a failed full span raises X13Error and a series too short
+        for any span raises ValueError. For a frame, such columns are left
+        out with a warning.
+
+        - seasadj : pandas.DataFrame
+          Seasonally adjusted series by span end date (rows) and date
+          (columns).
+        - max_pct_diff : pandas.Series
+          Maximum percent difference between spans by date, for dates
+          covered by at least two spans.
+        - stats : pandas.Series
+          Share of unstable dates and mean and maximum percent differences.
+        - order, sorder : tuple
+          The full-span ARIMA model reused for the spans.
+    """
+
+    def make_spans(s):
+        # shorten the spans of a short series so they still start a year apart
+        length = min(span_length, len(s) - 12 * (n_spans - 1))
+        if length < MIN_LENGTH:
+            return []
+        ends = [len(s) - 12 * i for i in range(n_spans - 1, -1, -1)]
+        return [s.index[end - length : end] for end in ends]
+
+    res = _run_spans(endog, make_spans, max_workers, x12path, kwargs)
+    if isinstance(endog, pd.DataFrame):
+        return {label: _sliding_spans_stats(r, threshold) for label, r in res.items()}
+    return _sliding_spans_stats(res, threshold)
+
+
+def _prepare_series(s: pd.Series) -> pd.Series:
+    # trim missing values at each ends
+    s = s.truncate(s.first_valid_index(), s.last_valid_index())
+
+    # fill missing values in the middle
+    s = s.fillna(0)
+
+    # x13 only needs an ASCII name, the vintages are labeled by end date
+    return s.rename("series")
+
+
+def _get_log_from_results(results):
+    if re.search("prefers log transformation", results.results):
+        return True
+    if re.search("prefers no transformation", results.results):
+        return False
+    return None
+
+
+def _run_spans(endog, make_spans, max_workers, x12path, kwargs):
+    if isinstance(endog, pd.Series):
+        name = "series" if endog.name is None else endog.name
+        series = {name: _prepare_series(endog)}
+    else:
+        series = {label: _prepare_series(s) for label, s in endog.items()}
+
+    # check the spans before spending a full x13 run on a series
+    spans = {}
+    for label, s in series.items():
+        spans[label] = [span for span in make_spans(s) if len(span) >= MIN_LENGTH]
+        if not spans[label]:
+            message = f"{label}: no span of at least {MIN_LENGTH} months"
+            if isinstance(endog, pd.Series):
+                raise ValueError(message)
+            warn(message)
+    spans = {label: label_spans for label, label_spans in spans.items() if label_spans}
+
+    def run_series(label, results):
+        arima_results = x13.get_arima_order_from_results(results)
+        order, sorder = arima_results.order, arima_results.sorder
+        log = kwargs.get("log")
+        span_kwargs = {
+            **kwargs,
+            "order": order,
+            "sorder": sorder,
+            "log": _get_log_from_results(results) if log is None else log,
+        }
+        s = series[label]
+        futures = {
+            span[-1]: executor.submit(
+                x13.x13_arima_analysis, s.loc[span], x12path=x12path, **span_kwargs
+            )
+            for span in spans[label]
+        }
+        return results, order, sorder, futures
+
+    res = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # identify the model once on the full span of every series
+        futures_full = {
+            label: executor.submit(
+                x13.x13_arima_analysis, series[label], x12path=x12path, **kwargs
+            )
+            for label in spans
+        }
+
+        # queue the spans of each series as soon as its model is known
+        runs = {}
+        for label, future in futures_full.items():
+            try:
+                runs[label] = run_series(label, future.result())
+            except X13Error as e:
+                if isinstance(endog, pd.Series):
+                    raise e
+                warn(f"{label}: {e}", X13Warning)
+
+        for label, run in runs.items():
+            results, order, sorder, futures = run
+
+            # leave failed spans out of the matrix, keep the others
+            seasadj = {}
+            for end, future in futures.items():
+                try:
+                    seasadj[end] = future.result().seasadj
+                except X13Error as e:
+                    warn(f"{label}, span ending {end:%Y-%m}: {e}", X13Warning)
+            res[label] = Bunch(
+                full=results.seasadj,
+                seasadj=pd.DataFrame(
+                    seasadj, index=series[label].index, dtype="float64"
+                ).T,
+                order=order,
+                sorder=sorder,
+            )
+
+    if isinstance(endog, pd.Series):
+        return res[name]
+    return res
+
+
+def _revision_stats(res):
+    full = res.full
+    seasadj = pd.concat([res.seasadj, full.to_frame(full.index[-1]).T])
+
+    # the concurrent estimate is the last date of each vintage
+    concurrent = pd.Series(
+        np.diag(seasadj.loc[:, seasadj.index].to_numpy()), index=seasadj.index
+    )
+    final = full.reindex(concurrent.index)
+    pct_revision = (final - concurrent) / concurrent.abs() * 100
+
+    revisions = pd.DataFrame(
+        {
+            "concurrent": concurrent,
+            "final": final,
+            "pct_revision": pct_revision,
+        }
+    ).iloc[:-1]
+    stats = pd.Series(
+        {
+            "mean_pct_revision": revisions.pct_revision.mean(),
+            "mean_abs_pct_revision": revisions.pct_revision.abs().mean(),
+            "max_abs_pct_revision": revisions.pct_revision.abs().max(),
+        }
+    )
+    return Bunch(
+        seasadj=seasadj,
+        revisions=revisions,
+        stats=stats,
+        order=res.order,
+        sorder=res.sorder,
+    )
+
+
+def _sliding_spans_stats(res, threshold):
+    seasadj = res.seasadj
+    covered = seasadj.notna().sum(axis="index") >= 2
+    max_pct_diff = ((seasadj.max() - seasadj.min()) / seasadj.abs().min() * 100)[
+        covered
+    ]
+    stats = pd.Series(
+        {
+            "share_unstable": (max_pct_diff > threshold).mean(),
+            "mean_pct_diff": max_pct_diff.mean(),
+            "max_pct_diff": max_pct_diff.max(),
+        }
+    )
+    return Bunch(
+        seasadj=seasadj,
+        max_pct_diff=max_pct_diff,
+        stats=stats,
+        order=res.order,
+        sorder=res.sorder,
+    )
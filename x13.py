@@ -50,6 +50,8 @@ def x13_arima_analysis(
     print_stdout=False,
     x12path=None,
     prefer_x13=True,
+    order=None,
+    sorder=None,
 ):
     """
     Perform x13-arima analysis for monthly or quarterly data.
@@ -112,6 +114,13 @@ def x13_arima_analysis(
         environmental variable. If False, will look for x12a first and will
         fallback to the X12PATH environmental variable. If x12path points
         to the path for the X12/X13 binary, it does nothing.
+    order : tuple or None
+        Fixes the regular ARIMA order, e.g. from a previous run's
+        ``get_arima_order_from_results``. If given, automatic model
+        identification is skipped and ``maxorder``, ``maxdiff`` and ``diff``
+        are ignored.
+    sorder : tuple or None
+        Fixes the seasonal ARIMA order. Only used together with ``order``.
 
     Returns
     -------
@@ -155,8 +164,11 @@ def x13_arima_analysis(
     spec += "transform{{function={0}}}\n".format(_log_to_x12[log])
     if outlier:
         spec += "outlier{}\n"
-    options = _make_automdl_options(maxorder, maxdiff, diff)
-    spec += "automdl{{{0}}}\n".format(options)
+    if order is not None:
+        spec += "arima{{model={0}}}\n".format(_make_arima_model(order, sorder))
+    else:
+        options = _make_automdl_options(maxorder, maxdiff, diff)
+        spec += "automdl{{{0}}}\n".format(options)
     spec += _make_regression_options(trading, exog)
     spec += _make_forecast_options(forecast_periods)
     spec += "x11{ save=(d10 d11 d12 d13) }"  # add seasonal
@@ -234,6 +246,13 @@ def x13_arima_analysis(
     return res
 
 
+def _make_arima_model(order, sorder=None):
+    model = "({0} {1} {2})".format(*order)
+    if sorder is not None:
+        model += "({0} {1} {2})".format(*sorder)
+    return model
+
+
 def get_arima_order_from_results(results):
     """
     Perform automatic seasonal ARIMA order identification using x12/x13 ARIMA.